@@ -4,7 +4,6 @@ import contextlib
 import enum
 import logging
 import logging.config
-import re
 import sys
 import typing
 
@@ -27,9 +26,6 @@ LOG_CONFIG = dict(
 logging.config.dictConfig(LOG_CONFIG)
 logger = logging.getLogger(__name__)
 
-TOPIC_REGEX = re.compile(
-    r"^(?P<base_topic>\w+)/(?P<entity>(input|relay|cover))/(?P<name>\w+)/(set|state)$"
-)
 TOPIC_FORMAT = "{base_topic}/{entity}/{name}/{action}"
 
 
@@ -56,24 +52,82 @@ class Payload(enum.Enum):
     STOP = b"STOP"
 
 
-class Shade:
-    OPENING = "opening"
-    CLOSING = "closing"
-    STOPPED = "stopped"
+# Plain aliases for values used on hot paths
+_PL_ON = Payload.ON.value
+_PL_OFF = Payload.OFF.value
+_PL_OPEN = Payload.OPEN.value
+_PL_CLOSE = Payload.CLOSE.value
+_PL_STOP = Payload.STOP.value
+
+# Shade states and directions
+_OPENING = "opening"
+_CLOSING = "closing"
+_STOPPED = "stopped"
+_OPEN = "open"
+_CLOSED = "closed"
+
+_DIR_OPENING = 1
+_DIR_CLOSING = -1
+_DIR_STOPPED = 0
 
-    OPEN = "open"
-    CLOSED = "closed"
+# Cover state payloads, encoded once
+_OPENING_PAYLOAD = _OPENING.encode()
+_CLOSING_PAYLOAD = _CLOSING.encode()
+_OPEN_PAYLOAD = _OPEN.encode()
+_CLOSED_PAYLOAD = _CLOSED.encode()
 
-    _DIRECTION_OPENING = 1
-    _DIRECTION_CLOSING = -1
-    _DIRECTION_STOPPED = 0
+# Relay state payloads mapped to the boolean relay state, shared by all shades
+_RELAY_PAYLOAD_STATE = {_PL_ON: True, _PL_OFF: False}
+
+
+class Shade:
+    OPENING = _OPENING
+    CLOSING = _CLOSING
+    STOPPED = _STOPPED
+
+    OPEN = _OPEN
+    CLOSED = _CLOSED
+
+    __slots__ = (
+        "cover",
+        "open_relay",
+        "close_relay",
+        "_open_relay_state",
+        "_close_relay_state",
+        "_state",
+        "position",
+        "_max_time",
+        "_max_position",
+        "_position_bytes",
+        "_direction",
+        "_sleep_time",
+        "_increment",
+        "_state_lock",
+        "_mqtt_base_topic_cover",
+        "_mqtt_base_topic_relay",
+        "_logger",
+        "_cover_cmd_dispatch",
+        "_transitions",
+        # Topics
+        "_cover_command_topic",
+        "_cover_state_topic",
+        "_cover_position_topic",
+        "_open_relay_state_topic",
+        "_close_relay_state_topic",
+        "_open_relay_command_topic",
+        "_close_relay_command_topic",
+        "_relay_state_index",
+        # Assigned in run()
+        "_mqtt_client",
+        "_relay_state_changed",
+        "_edge_reached",
+    )
 
     def __init__(
         self,
         cover: str,
         open_relay: str,
         close_relay: str,
-        mqtt_host: str,
         mqtt_base_topic_cover: str,
         mqtt_base_topic_relay: str,
         sleep_time: float = 0.5,
@@ -85,24 +139,23 @@ class Shade:
         self.close_relay = close_relay
         self._open_relay_state = False
         self._close_relay_state = False
-        self._state = Shade.STOPPED
+        self._state = _STOPPED
 
         # Position tracking
         self.position = max_position
         self._max_time = max_time
         self._max_position = max_position
-        self._direction = self._DIRECTION_STOPPED
-        self._direction_lock = asyncio.Lock()
+        self._position_bytes = tuple(
+            str(i).encode("ascii") for i in range(max_position + 1)
+        )
+        self._direction = _DIR_STOPPED
         self._sleep_time = sleep_time
         self._increment = int(
             round(self._max_position * self._sleep_time / self._max_time)
         )
 
-        self._open_relay_lock = asyncio.Lock()
-        self._close_relay_lock = asyncio.Lock()
         self._state_lock = asyncio.Lock()
 
-        self._mqtt_host = mqtt_host
         self._mqtt_base_topic_cover = mqtt_base_topic_cover
         self._mqtt_base_topic_relay = mqtt_base_topic_relay
 
@@ -111,6 +164,44 @@ class Shade:
 
         self._topics()
 
+        # Payload dispatch tables
+        self._cover_cmd_dispatch = {
+            _PL_OPEN: self.set_open,
+            _PL_STOP: self.set_stop,
+            _PL_CLOSE: self.set_close,
+        }
+        # Steps to run per (command, current state), in order
+        self._transitions = {
+            (_PL_OPEN, _STOPPED): (
+                self._set_close_relay_off,
+                self._set_open_relay_on,
+                self._state_opening,
+            ),
+            (_PL_OPEN, _CLOSING): (
+                # First stop everything
+                self._set_close_relay_off,
+                self._set_open_relay_off,
+                self._state_stopped,
+                # Then, open again; the close relay is already off
+                self._set_open_relay_on,
+                self._state_opening,
+            ),
+            (_PL_CLOSE, _STOPPED): (
+                self._set_close_relay_on,
+                self._set_open_relay_off,
+                self._state_closing,
+            ),
+            (_PL_CLOSE, _OPENING): (
+                # First stop everything
+                self._set_close_relay_off,
+                self._set_open_relay_off,
+                self._state_stopped,
+                # Then, close again; the open relay is already off
+                self._set_close_relay_on,
+                self._state_closing,
+            ),
+        }
+
     def _topics(self) -> None:
         """Calculate and assign MQTT topics required for shade"""
         self._logger.debug("initialize the topics")
@@ -150,14 +241,6 @@ class Shade:
             action=Action.STATE.value,
         )
         self._logger.debug(f"close relay state topic {self._close_relay_state_topic}")
-        # Wildcard here
-        self._relay_state_filter = TOPIC_FORMAT.format(
-            base_topic=self._mqtt_base_topic_relay,
-            entity=Entity.RELAY.value,
-            name="+",
-            action=Action.STATE.value,
-        )
-        self._logger.debug(f"relay state topic {self._relay_state_filter}")
         self._open_relay_command_topic = TOPIC_FORMAT.format(
             base_topic=self._mqtt_base_topic_relay,
             entity=Entity.RELAY.value,
@@ -172,52 +255,61 @@ class Shade:
             action=Action.COMMAND.value,
         )
         self._logger.debug(f"close relay command topic {self._close_relay_state_topic}")
+        # Index relay state topics to the attribute they update
+        self._relay_state_index = {
+            self._open_relay_state_topic: "_open_relay_state",
+            self._close_relay_state_topic: "_close_relay_state",
+        }
 
-    # Position tracking
-    async def run(self) -> None:
-        """Main async coroutine"""
+    async def run(self, mqtt_client: asyncio_mqtt.Client) -> None:
+        """Main async coroutine, handling messages on a (shared) connected MQTT client"""
         self._logger.info("start tracking ...")
-        async with contextlib.AsyncExitStack() as stack:
-            # Connects to the MQTT host using the context manager
-            self._mqtt_client = asyncio_mqtt.Client(self._mqtt_host)
-            await stack.enter_async_context(self._mqtt_client)
+        self._mqtt_client = mqtt_client
+        # Created here so they bind to the running loop
+        self._relay_state_changed = asyncio.Event()
+        self._edge_reached = asyncio.Event()
+
+        await _run_all(
+            self._subscribe_cover(),
+            self._subscribe_relays(),
+            self._stop_at_edges(),
+        )
 
-            await asyncio.gather(
-                self._subscribe_cover(),
-                self._subscribe_relays(),
-                self._track_position(),
-            )
+    @property
+    def sleep_time(self) -> float:
+        """Position tracking tick, the position increment is derived from it"""
+        return self._sleep_time
 
     async def _subscribe_relays(self) -> None:
         """Subscribe to and handle relay state topic updates"""
         self._logger.debug("subscribe to and handle relay state topics")
-        await asyncio.gather(
-            self._mqtt_client.subscribe(self._open_relay_state_topic),
-            self._mqtt_client.subscribe(self._close_relay_state_topic),
+        # Both topics in a single SUBSCRIBE packet
+        await self._mqtt_client.subscribe(
+            [(self._open_relay_state_topic, 0), (self._close_relay_state_topic, 0)]
         )
-        async with self._mqtt_client.filtered_messages(
-            self._relay_state_filter
-        ) as messages:
+        await _run_all(
+            *(
+                self._handle_relay_state(topic, attr)
+                for topic, attr in self._relay_state_index.items()
+            )
+        )
+
+    async def _handle_relay_state(self, topic: str, attr: str) -> None:
+        """Handle state updates for a single relay"""
+        # Filter on the exact relay topic: the client keeps a single callback per filter,
+        # so a wildcard filter shared between shades would only reach the last one
+        async with self._mqtt_client.filtered_messages(topic) as messages:
             async for message in messages:
-                if message.topic not in (
-                    self._open_relay_state_topic,
-                    self._close_relay_state_topic,
-                ):
+                if message.topic != topic:
                     continue
-                self._logger.info(f"relays message {message.topic} -- {message.payload.decode()}")
+                if self._logger.isEnabledFor(logging.INFO):
+                    self._logger.info("relays message %s -- %s", message.topic, message.payload.decode())
                 # Update relay state
-                if message.topic == self._open_relay_state_topic:
-                    async with self._open_relay_lock:
-                        if message.payload == Payload.ON.value:
-                            self._open_relay_state = True
-                        elif message.payload == Payload.OFF.value:
-                            self._open_relay_state = False
-                elif message.topic == self._close_relay_state_topic:
-                    async with self._close_relay_lock:
-                        if message.payload == Payload.ON.value:
-                            self._close_relay_state = True
-                        elif message.payload == Payload.OFF.value:
-                            self._close_relay_state = False
+                state = _RELAY_PAYLOAD_STATE.get(message.payload)
+                if state is None:
+                    continue
+                setattr(self, attr, state)
+                self._relay_state_changed.set()
 
     async def _subscribe_cover(self) -> None:
         """Subscribe to and handle cover command topic"""
@@ -229,186 +321,159 @@ class Shade:
             async for message in messages:
                 if message.topic != self._cover_command_topic:
                     continue
-                self._logger.info(f"cover message {message.topic} -- {message.payload.decode()}")
-                if message.payload == Payload.OPEN.value:
-                    await self.set_open()
-                elif message.payload == Payload.STOP.value:
-                    await self.set_stop()
-                elif message.payload == Payload.CLOSE.value:
-                    await self.set_close()
-
-    async def _track_position(self) -> None:
-        self._logger.debug("start tracking position")
+                if self._logger.isEnabledFor(logging.INFO):
+                    self._logger.info("cover message %s -- %s", message.topic, message.payload.decode())
+                handler = self._cover_cmd_dispatch.get(message.payload)
+                if handler is not None:
+                    await handler()
+
+    # Position tracking
+    def advance_position(self) -> bool:
+        """Advance the position by one tick, return whether there is anything to publish"""
+        new_position = self.position + self._direction * self._increment
+        if not 0 <= new_position <= self._max_position:
+            self._direction = _DIR_STOPPED
+            new_position = 0 if new_position < 0 else self._max_position
+
+        self.position = new_position
+        self._logger.debug("position: %s", self.position)
+        return self._direction != _DIR_STOPPED or self._state != _STOPPED
+
+    async def publish_position(self) -> None:
+        """Publish the current position, signalling a stop at the edges"""
+        if (
+            0 < self.position < self._max_position
+            and self._direction != _DIR_STOPPED
+        ):
+            await self._mqtt_client.publish(
+                self._cover_position_topic,
+                self._position_bytes[self.position],
+            )
+
+        # Push out event for the edges; the stop itself waits for relay feedback,
+        # so it runs in this shade's own coroutine to keep the other shades moving
+        if self._state != _STOPPED and self.position in (0, self._max_position):
+            self._edge_reached.set()
+
+    async def _stop_at_edges(self) -> None:
+        """Stop everything and publish the final position and state when reaching an edge"""
         while True:
-            new_position = int(self.position + self._direction * self._increment)
-            if not 0 <= new_position <= self._max_position:
-                self._direction = Shade._DIRECTION_STOPPED
-                new_position = max([min([self._max_position, new_position]), 0])
-
-            self.position = new_position
-            self._logger.debug(f"position: {self.position}")
-            if (
-                0 < self.position < self._max_position
-                and self._direction != Shade._DIRECTION_STOPPED
-            ):
-                await self._mqtt_client.publish(
+            await self._edge_reached.wait()
+            self._edge_reached.clear()
+            # Already handled while a previous stop was in progress
+            if self._state == _STOPPED or self.position not in (0, self._max_position):
+                continue
+            # Fire all publishes before waiting on any of them
+            await asyncio.gather(
+                self._set_close_relay_off(),
+                self._set_open_relay_off(),
+                self._mqtt_client.publish(
                     self._cover_position_topic,
-                    str(self.position).encode(),
-                )
-
-            # Push out event for the edges
-            if self.position == 0 and self._state != Shade.STOPPED:
-                # Stop everything
-                await asyncio.gather(
-                    self.set_stop(),
-                    self._mqtt_client.publish(
-                        self._cover_position_topic,
-                        str(self.position).encode(),
-                    ),
-                    self._mqtt_client.publish(
-                        self._cover_state_topic,
-                        Shade.CLOSED,
-                    ),
-                )
-            elif self.position == self._max_position and self._state != Shade.STOPPED:
-                await asyncio.gather(
-                    self.set_stop(),
-                    self._mqtt_client.publish(
-                        self._cover_position_topic,
-                        str(self.position).encode(),
-                    ),
-                    self._mqtt_client.publish(
-                        self._cover_state_topic,
-                        Shade.OPEN,
-                    ),
-                )
-
-            await asyncio.sleep(self._sleep_time)
+                    self._position_bytes[self.position],
+                ),
+                self._mqtt_client.publish(
+                    self._cover_state_topic,
+                    _CLOSED_PAYLOAD if self.position == 0 else _OPEN_PAYLOAD,
+                ),
+                self._state_stopped(),
+            )
 
     async def _position_open(self) -> None:
         """Start counter for open direction"""
-        async with self._direction_lock:
-            self._direction = Shade._DIRECTION_OPENING
+        self._direction = _DIR_OPENING
 
     async def _position_close(self) -> None:
         """Start counter for close direction"""
-        async with self._direction_lock:
-            self._direction = Shade._DIRECTION_CLOSING
+        self._direction = _DIR_CLOSING
 
     async def _position_stop(self) -> None:
         """Stop counter"""
-        async with self._direction_lock:
-            self._direction = Shade._DIRECTION_STOPPED
+        self._direction = _DIR_STOPPED
 
     # Commands: incoming commands for state transitions
+    async def _transition(self, command: bytes, name: str) -> None:
+        """Run the steps for a command from the current state, if any"""
+        steps = self._transitions.get((command, self._state))
+        if steps is None:
+            return
+        self._logger.debug("%s on %s state", name, self._state)
+        for step in steps:
+            await step()
+
     async def set_open(self) -> None:
         """Open shade from command"""
-        if self._state == Shade.STOPPED:
-            self._logger.debug("open on stopped state")
-            await asyncio.gather(
-                self._set_close_relay_off(),
-                self._set_open_relay_on(),
-                self._state_opening(),
-            )
-        elif self._state == Shade.CLOSING:
-            self._logger.debug("open on closing state")
-            # First stop everything
-            await asyncio.gather(
-                self._set_close_relay_off(),
-                self._set_open_relay_off(),
-                self._state_stopped(),
-            )
-            # Then, open again
-            await asyncio.gather(
-                self._set_close_relay_off(),
-                self._set_open_relay_on(),
-                self._state_opening(),
-            )
+        await self._transition(_PL_OPEN, "open")
 
     async def set_stop(self) -> None:
         """Stop shade from command"""
-        await asyncio.gather(
-            self._set_close_relay_off(),
-            self._set_open_relay_off(),
-            self._state_stopped(),
-        )
+        await self._set_close_relay_off()
+        await self._set_open_relay_off()
+        await self._state_stopped()
 
     async def set_close(self) -> None:
         """Close shade from command"""
-        if self._state == Shade.STOPPED:
-            self._logger.debug("close on stopped state")
-            await asyncio.gather(
-                self._set_close_relay_on(),
-                self._set_open_relay_off(),
-                self._state_closing(),
-            )
-        elif self._state == Shade.OPENING:
-            self._logger.debug("close on opening state")
-            # First stop everything
-            await asyncio.gather(
-                self._set_close_relay_off(),
-                self._set_open_relay_off(),
-                self._state_stopped(),
-            )
-            # Then, close again
-            await asyncio.gather(
-                self._set_close_relay_on(),
-                self._set_open_relay_off(),
-                self._state_closing(),
-            )
+        await self._transition(_PL_CLOSE, "close")
 
     # Relays
 
     # Incoming state: wait for relay states to have been updated
+    async def _wait_relay_state(self) -> None:
+        """Wait for a relay state update, re-checking at least every sleep time"""
+        self._relay_state_changed.clear()
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._relay_state_changed.wait(), self._sleep_time)
+
     async def _state_opening(self) -> None:
         while not (self._open_relay_state and not self._close_relay_state):
             self._logger.debug(
-                f"open relay state {self._open_relay_state} -- close relay state {self._close_relay_state}"
+                "open relay state %s -- close relay state %s",
+                self._open_relay_state,
+                self._close_relay_state,
             )
-            await asyncio.sleep(self._sleep_time)
+            await self._wait_relay_state()
 
         async with self._state_lock:
             old_state = self._state
-            self._state = Shade.OPENING
-            self._logger.debug(f"state update from {old_state} to {self._state}")
-            await asyncio.gather(
-                self._position_open(),
-                self._mqtt_client.publish(
-                    self._cover_state_topic,
-                    Shade.OPENING,
-                ),
+            self._state = _OPENING
+            self._logger.debug("state update from %s to %s", old_state, self._state)
+            await self._position_open()
+            await self._mqtt_client.publish(
+                self._cover_state_topic,
+                _OPENING_PAYLOAD,
             )
 
     async def _state_stopped(self) -> None:
         while not (not self._open_relay_state and not self._close_relay_state):
             self._logger.debug(
-                f"open relay state {self._open_relay_state} -- close relay state {self._close_relay_state}"
+                "open relay state %s -- close relay state %s",
+                self._open_relay_state,
+                self._close_relay_state,
             )
-            await asyncio.sleep(self._sleep_time)
+            await self._wait_relay_state()
 
         async with self._state_lock:
             old_state = self._state
-            self._state = Shade.STOPPED
-            self._logger.debug(f"state update from {old_state} to {self._state}")
+            self._state = _STOPPED
+            self._logger.debug("state update from %s to %s", old_state, self._state)
             await self._position_stop()
 
     async def _state_closing(self) -> None:
         while not (not self._open_relay_state and self._close_relay_state):
             self._logger.debug(
-                f"open relay state {self._open_relay_state} -- close relay state {self._close_relay_state}"
+                "open relay state %s -- close relay state %s",
+                self._open_relay_state,
+                self._close_relay_state,
             )
-            await asyncio.sleep(self._sleep_time)
+            await self._wait_relay_state()
 
         async with self._state_lock:
             old_state = self._state
-            self._state = Shade.CLOSING
-            self._logger.debug(f"state update from {old_state} to {self._state}")
-            await asyncio.gather(
-                self._position_close(),
-                self._mqtt_client.publish(
-                    self._cover_state_topic,
-                    Shade.CLOSING,
-                ),
+            self._state = _CLOSING
+            self._logger.debug("state update from %s to %s", old_state, self._state)
+            await self._position_close()
+            await self._mqtt_client.publish(
+                self._cover_state_topic,
+                _CLOSING_PAYLOAD,
             )
 
     # Incoming state: update the relay state from MQTT
@@ -417,7 +482,7 @@ class Shade:
         self._logger.info("set open relay on")
         await self._mqtt_client.publish(
             self._open_relay_command_topic,
-            Payload.ON.value,
+            _PL_ON,
         )
 
     async def _set_open_relay_off(self) -> None:
@@ -425,7 +490,7 @@ class Shade:
         self._logger.info("set open relay off")
         await self._mqtt_client.publish(
             self._open_relay_command_topic,
-            Payload.OFF.value,
+            _PL_OFF,
         )
 
     async def _set_close_relay_on(self) -> None:
@@ -433,7 +498,7 @@ class Shade:
         self._logger.info("set close relay on")
         await self._mqtt_client.publish(
             self._close_relay_command_topic,
-            Payload.ON.value,
+            _PL_ON,
         )
 
     async def _set_close_relay_off(self) -> None:
@@ -441,26 +506,58 @@ class Shade:
         self._logger.info("set close relay off")
         await self._mqtt_client.publish(
             self._close_relay_command_topic,
-            Payload.OFF.value,
+            _PL_OFF,
         )
 
 
+class Supervisor:
+    """Runs a group of shades on one MQTT client and drives their position tracking from a single timer"""
+
+    def __init__(
+        self,
+        shades: typing.Iterable[Shade],
+        mqtt_client: asyncio_mqtt.Client,
+    ):
+        self.shades = list(shades)
+        self._mqtt_client = mqtt_client
+        # Tick at the shades' own sleep time, their position increments are derived from it
+        sleep_times = {shade.sleep_time for shade in self.shades}
+        if len(sleep_times) > 1:
+            raise ValueError(f"shades use different sleep times {sorted(sleep_times)}")
+        self._sleep_time = sleep_times.pop() if sleep_times else 0.5
+
+    async def run(self) -> None:
+        """Main async coroutine"""
+        await _run_all(
+            *(shade.run(self._mqtt_client) for shade in self.shades),
+            self._track_positions(),
+        )
+
+    async def _track_positions(self) -> None:
+        """Advance every shade each tick and publish only for those that moved"""
+        logger.debug("start tracking positions")
+        while True:
+            moving = [shade for shade in self.shades if shade.advance_position()]
+            if moving:
+                await asyncio.gather(*(shade.publish_position() for shade in moving))
+            await asyncio.sleep(self._sleep_time)
+
+
 def _shades_from_config(
     config: typing.Dict[str, typing.Dict[str, str]],
-    host: str,
     cover_base: str,
     relay_base: str,
 ) -> typing.Iterable[Shade]:
     """Build list of shades from yaml config file"""
     return [
-        Shade(name, relays["open"], relays["close"], host, cover_base, relay_base)
+        Shade(name, relays["open"], relays["close"], cover_base, relay_base)
         for name, relays in config.items()
     ]
 
 
 def _is_config_valid(config: typing.Dict[str, typing.Dict[str, str]]) -> bool:
     """Validate YAML file config"""
-    relays = []
+    relays: typing.Set[str] = set()
     for name, relay_map in config.items():
         for op in relay_map.keys():
             if op not in ("open", "close"):
@@ -474,15 +571,40 @@ def _is_config_valid(config: typing.Dict[str, typing.Dict[str, str]]) -> bool:
                 logger.warning(f"Non-unique relay name {relay}")
                 return False
             else:
-                relays.append(relay)
+                relays.add(relay)
     return True
 
 
-async def main(shades: typing.Iterable[Shade]) -> None:
-    await asyncio.gather(*(shade.run() for shade in shades))
+async def _run_all(*coros: typing.Awaitable[None]) -> None:
+    """Run coroutines as tasks until all finish or one fails, cancelling the rest on failure"""
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Let the cancelled tasks run their cleanup before returning
+        await asyncio.gather(*tasks, return_exceptions=True)
+    for task in done:
+        task.result()
 
 
-if __name__ == "__main__":
+async def main(shades: typing.Iterable[Shade], mqtt_host: str) -> None:
+    # Single connection to the MQTT host, shared by all shades
+    async with asyncio_mqtt.Client(mqtt_host) as mqtt_client:
+        await Supervisor(shades, mqtt_client).run()
+
+
+def cli() -> None:
+    """Command line entry point"""
+    # Use the faster uvloop event loop when it is available
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     parser = argparse.ArgumentParser()
     parser.add_argument("config", help="Config file mapping covers to relays")
     parser.add_argument("--mqtt_host", help="MQTT broker host", default="shuttle.lan")
@@ -492,8 +614,10 @@ if __name__ == "__main__":
 
     logger.info("building shades from config")
 
-    with open(args.config, "r") as fh:
-        config = yaml.safe_load(fh)
+    # Hand the raw bytes to the (libyaml backed, when available) loader in one go
+    with open(args.config, "rb") as fh:
+        data = fh.read()
+    config = yaml.load(data, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     if not _is_config_valid(config):
         logger.warning("invalid config, stopping")
@@ -501,9 +625,12 @@ if __name__ == "__main__":
 
     shades = _shades_from_config(
         config,
-        args.mqtt_host,
         args.mqtt_base_topic_cover,
         args.mqtt_base_topic_relay,
     )
     logger.info("start monitoring shades")
-    asyncio.run(main(shades))
+    asyncio.run(main(shades, args.mqtt_host))
+
+
+if __name__ == "__main__":
+    cli()
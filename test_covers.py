@@ -0,0 +1,109 @@
+import asyncio
+import contextlib
+import unittest
+
+import paho.mqtt.client as mqtt
+
+import covers
+
+
+class FakeClient:
+    """In-memory stand-in for asyncio_mqtt.Client, echoing relay commands back as relay states"""
+
+    def __init__(self):
+        self.published = []
+        # Like paho, a single callback (here: queue) per topic filter
+        self._filters = {}
+
+    async def subscribe(self, *args, **kwargs) -> None:
+        pass
+
+    async def publish(self, topic, payload=None, **kwargs) -> None:
+        self.published.append((topic, payload))
+        if topic.startswith("shady/relay/") and topic.endswith("/set"):
+            self.deliver(topic[: -len("set")] + "state", payload)
+
+    def deliver(self, topic: str, payload: bytes) -> None:
+        for topic_filter, queue in self._filters.items():
+            if mqtt.topic_matches_sub(topic_filter, topic):
+                message = mqtt.MQTTMessage(topic=topic.encode())
+                message.payload = payload
+                queue.put_nowait(message)
+
+    @contextlib.asynccontextmanager
+    async def filtered_messages(self, topic_filter, **kwargs):
+        queue = asyncio.Queue()
+        self._filters[topic_filter] = queue
+
+        async def messages():
+            while True:
+                yield await queue.get()
+
+        try:
+            yield messages()
+        finally:
+            del self._filters[topic_filter]
+
+
+class ShadeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = FakeClient()
+
+    async def _run(self, *shades):
+        task = asyncio.create_task(covers.Supervisor(shades, self.client).run())
+        self.addAsyncCleanup(self._cancel, task)
+        # Wait for every shade to listen on its cover command and both relay state topics
+        await self._wait_for(lambda: len(self.client._filters) == 3 * len(shades))
+
+    async def _cancel(self, task):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _wait_for(self, condition, timeout=1.0):
+        async def poll():
+            while not condition():
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(poll(), timeout)
+
+    @staticmethod
+    def _shade(name, open_relay, close_relay):
+        return covers.Shade(name, open_relay, close_relay, "homeassistant", "shady", sleep_time=0.01, max_time=5.0)
+
+    async def test_reversal_switches_close_relay_off_once(self):
+        shade = self._shade("office", "1", "2")
+        await self._run(shade)
+
+        self.client.deliver("homeassistant/cover/office/set", b"CLOSE")
+        await self._wait_for(lambda: shade._state == covers.Shade.CLOSING)
+        self.client.published.clear()
+
+        self.client.deliver("homeassistant/cover/office/set", b"OPEN")
+        await self._wait_for(lambda: shade._state == covers.Shade.OPENING)
+
+        relay_commands = [(topic, payload) for topic, payload in self.client.published if topic.startswith("shady/")]
+        self.assertEqual(
+            relay_commands,
+            [
+                ("shady/relay/2/set", b"OFF"),
+                ("shady/relay/1/set", b"OFF"),
+                ("shady/relay/1/set", b"ON"),
+            ],
+        )
+
+    async def test_shades_sharing_a_client_all_receive_relay_states(self):
+        office = self._shade("office", "1", "2")
+        kitchen = self._shade("kitchen", "3", "4")
+        await self._run(office, kitchen)
+
+        self.client.deliver("homeassistant/cover/office/set", b"CLOSE")
+        self.client.deliver("homeassistant/cover/kitchen/set", b"CLOSE")
+        await self._wait_for(lambda: office._state == kitchen._state == covers.Shade.CLOSING)
+
+        self.assertTrue(office._close_relay_state)
+        self.assertTrue(kitchen._close_relay_state)
+
+
+if __name__ == "__main__":
+    unittest.main()